@@ -2,9 +2,12 @@ from __future__ import annotations
 
 import os
 import dataclasses
+import functools
 import types
 from typing import Any, cast, Tuple, Dict, Sequence
 
+import grpc
+
 import google.ai.generativelanguage as glm
 
 from google.auth import credentials as ga_credentials
@@ -21,6 +24,8 @@ except ImportError:
 
 USER_AGENT = "genai-py"
 
+_UNSET = object()
+
 
 @dataclasses.dataclass
 class _ClientManager:
@@ -29,6 +34,14 @@ class _ClientManager:
     discuss_client: glm.DiscussServiceClient | None = None
     discuss_async_client: glm.DiscussServiceAsyncClient | None = None
     clients: dict[str, Any] = dataclasses.field(default_factory=dict)
+    # Maps a transport name to a `(channel, host)` pair shared by every client using that
+    # transport. Only sync "grpc" channels are shared, `grpc.aio` channels are bound to the
+    # event loop they were created on.
+    _channels: dict[str, Tuple[Any, str]] = dataclasses.field(default_factory=dict)
+    # The arguments of the last successful `configure` call.
+    _configure_args: Tuple[Any, ...] | None = None
+    # `GOOGLE_API_KEY`, read from the environment the first time it's needed.
+    _env_api_key: str | None | object = _UNSET
 
     def configure(
         self,
@@ -50,6 +63,8 @@ class _ClientManager:
 
         If no API key has been provided (either directly, or on `client_options`) and the
         `GOOGLE_API_KEY` environment variable is set, it will be used as the API key.
+        The environment variable is only read the first time it's needed, so it must be set
+        before then.
 
         Note: Not all arguments are detailed below. Refer to the `*ServiceClient` classes in
         `google.ai.generativelanguage` for details on the other arguments.
@@ -63,6 +78,21 @@ class _ClientManager:
             default_metadata: Default (key, value) metadata pairs to send with every request.
                 when using `transport="rest"` these are sent as HTTP headers.
         """
+        configure_args = (
+            api_key,
+            credentials,
+            transport,
+            client_options,
+            client_info,
+            tuple(default_metadata),
+            self._get_env_api_key() if api_key is None else None,
+        )
+        if self._configure_args is not None and _same_configure_args(
+            configure_args, self._configure_args
+        ):
+            # Library code often calls `configure` defensively, there's nothing to rebuild.
+            return
+
         if isinstance(client_options, dict):
             client_options = client_options_lib.from_dict(client_options)
         if client_options is None:
@@ -77,7 +107,7 @@ class _ClientManager:
             if api_key is None:
                 # If no key is provided explicitly, attempt to load one from the
                 # environment.
-                api_key = os.getenv("GOOGLE_API_KEY")
+                api_key = self._get_env_api_key()
 
             client_options.api_key = api_key
 
@@ -100,56 +130,90 @@ class _ClientManager:
 
         client_config = {key: value for key, value in client_config.items() if value is not None}
 
+        # Clients are built lazily, so only the stale ones need to be dropped.
+        # Anything cached before the first `configure` was set by hand, keep it.
+        if self.client_config and self._config_changed(client_config, default_metadata):
+            # Clients handed out earlier may still use the old channels, so they are
+            # not closed here. They're released once those clients are gone.
+            self.clients = {}
+            self._channels = {}
+
         self.client_config = client_config
         self.default_metadata = default_metadata
+        self._configure_args = configure_args
+
+    def _get_env_api_key(self) -> str | None:
+        if self._env_api_key is _UNSET:
+            self._env_api_key = os.getenv("GOOGLE_API_KEY")
+        return self._env_api_key
+
+    def _config_changed(
+        self, client_config: Dict[str, Any], default_metadata: Sequence[Tuple[str, str]]
+    ) -> bool:
+        if tuple(self.default_metadata) != tuple(default_metadata):
+            return True
+        if self.client_config.keys() != client_config.keys():
+            return True
+
+        for key, value in client_config.items():
+            old_value = self.client_config[key]
+            if old_value is value:
+                continue
+            if key in ("client_options", "client_info"):
+                # Neither class defines `__eq__`.
+                if vars(old_value) != vars(value):
+                    return True
+            elif old_value != value:
+                return True
 
-        self.clients = {}
+        return False
 
     def make_client(self, name):
-        if name.endswith("_async"):
+        is_async = name.endswith("_async")
+        if is_async:
             name = name.split("_")[0]
             cls = getattr(glm, name.title() + "ServiceAsyncClient")
         else:
             cls = getattr(glm, name.title() + "ServiceClient")
 
-        # Attempt to configure using defaults.
-        if not self.client_config:
-            configure()
-
-        client = cls(**self.client_config)
-
         if not self.default_metadata:
-            return client
-
-        def keep(name, f):
-            if name.startswith("_"):
-                return False
-            elif not isinstance(f, types.FunctionType):
-                return False
-            elif isinstance(f, classmethod):
-                return False
-            elif isinstance(f, staticmethod):
-                return False
-            else:
-                return True
-
-        def add_default_metadata_wrapper(f):
-            def call(*args, metadata=(), **kwargs):
-                metadata = list(metadata) + list(self.default_metadata)
-                return f(*args, **kwargs, metadata=metadata)
-
-            return call
-
-        for name, value in cls.__dict__.items():
-            if not keep(name, value):
-                continue
-            f = getattr(client, name)
-            f = add_default_metadata_wrapper(f)
-            setattr(client, name, f)
+            return self._make_client_on_shared_channel(cls, is_async)
 
+        client = self._make_client_on_shared_channel(_with_default_metadata(cls), is_async)
+        client._default_metadata = tuple(self.default_metadata)
         return client
 
+    def _make_client_on_shared_channel(self, cls, is_async: bool):
+        # All the services live on the same endpoint, so sync gRPC clients can multiplex
+        # over one channel instead of each opening a connection.
+        transport_name = self.client_config.get("transport", "grpc")
+        if is_async or transport_name != "grpc":
+            return cls(**self.client_config)
+
+        shared = self._channels.get(transport_name)
+        if shared is None:
+            client = cls(**self.client_config)
+            transport = getattr(client, "transport", None)
+            channel = getattr(transport, "grpc_channel", None)
+            if not isinstance(channel, grpc.Channel):
+                return client
+            # This client is dropped, it only served to build the channel with the
+            # configured credentials and endpoint.
+            shared = (_SharedChannel(channel), transport._host)
+            self._channels[transport_name] = shared
+
+        channel, host = shared
+        transport_cls = cls.get_transport_class(transport_name)
+        transport = transport_cls(
+            channel=channel, host=host, client_info=self.client_config["client_info"]
+        )
+        return cls(transport=transport)
+
     def get_default_client(self, name):
+        # Attempt to configure using defaults.
+        if not self.client_config:
+            self.configure()
+
         name = name.lower()
         if name == "operations":
             return self.get_default_operations_client()
@@ -169,6 +233,90 @@ class _ClientManager:
         return client
 
 
+class _SharedChannel(grpc.Channel):
+    """A channel used by several default clients.
+
+    Closing one client (`client.transport.close()`, or leaving a `with client:` block) must not
+    break the others, so `close` is a no-op. The underlying channel is released once no client
+    refers to it anymore.
+    """
+
+    def __init__(self, channel: grpc.Channel):
+        self._channel = channel
+
+    def subscribe(self, callback, try_to_connect=False):
+        self._channel.subscribe(callback, try_to_connect=try_to_connect)
+
+    def unsubscribe(self, callback):
+        self._channel.unsubscribe(callback)
+
+    def unary_unary(self, *args, **kwargs):
+        return self._channel.unary_unary(*args, **kwargs)
+
+    def unary_stream(self, *args, **kwargs):
+        return self._channel.unary_stream(*args, **kwargs)
+
+    def stream_unary(self, *args, **kwargs):
+        return self._channel.stream_unary(*args, **kwargs)
+
+    def stream_stream(self, *args, **kwargs):
+        return self._channel.stream_stream(*args, **kwargs)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+def _same_configure_args(args: Tuple[Any, ...], other_args: Tuple[Any, ...]) -> bool:
+    # Objects (credentials, client options, ...) are compared by identity, so changes made
+    # by mutating an object that was already passed in require passing a new object.
+    return all(a is b or (isinstance(a, (str, tuple)) and a == b) for a, b in zip(args, other_args))
+
+
+@functools.lru_cache(maxsize=None)
+def _with_default_metadata(cls):
+    """Returns a subclass of `cls` whose public methods add `self._default_metadata`.
+
+    The wrappers live on the class, built once per client class, so the client instances
+    don't each carry a copy of every method.
+    """
+
+    def keep(name, f):
+        if name.startswith("_"):
+            return False
+        elif not isinstance(f, types.FunctionType):
+            return False
+        elif isinstance(f, classmethod):
+            return False
+        elif isinstance(f, staticmethod):
+            return False
+        else:
+            return True
+
+    def add_default_metadata_wrapper(f):
+        @functools.wraps(f)
+        def call(self, *args, metadata=(), **kwargs):
+            default_metadata = self._default_metadata
+            metadata = (*metadata, *default_metadata) if metadata else default_metadata
+            return f(self, *args, **kwargs, metadata=metadata)
+
+        return call
+
+    namespace = {
+        name: add_default_metadata_wrapper(value)
+        for name, value in cls.__dict__.items()
+        if keep(name, value)
+    }
+    # For instances built some other way, like the `from_service_account_*` classmethods.
+    namespace["_default_metadata"] = ()
+    return type(cls.__name__, (cls,), namespace)
+
+
 def configure(
     *,
     api_key: str | None = None,
@@ -188,6 +336,8 @@ def configure(
 
     If no API key has been provided (either directly, or on `client_options`) and the
     `GOOGLE_API_KEY` environment variable is set, it will be used as the API key.
+    The environment variable is only read the first time it's needed, so it must be set
+    before then.
 
     Note: Not all arguments are detailed below. Refer to the `*ServiceClient` classes in
     `google.ai.generativelanguage` for details on the other arguments.
@@ -212,7 +362,6 @@ def configure(
 
 
 _client_manager = _ClientManager()
-_client_manager.configure()
 
 
 def get_default_discuss_client() -> glm.DiscussServiceClient:
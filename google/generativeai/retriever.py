@@ -14,18 +14,21 @@
 # limitations under the License.
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
 import re
 import string
 import dataclasses
-from typing import AsyncIterable, Iterable, Optional
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, Optional, TypeVar
 
 import google.ai.generativelanguage as glm
 
 from google.generativeai.client import get_default_retriever_client
 from google.generativeai.client import get_default_retriever_async_client
-from google.generativeai.types.model_types import idecode_time
 from google.generativeai.types import retriever_types
 
+T = TypeVar("T")
+
 
 def create_corpus(
     name: str,
@@ -62,11 +65,7 @@ def create_corpus(
 
     request = glm.CreateCorpusRequest(corpus=corpus)
     response = client.create_corpus(request)
-    response = type(response).to_dict(response)
-    idecode_time(response, "create_time")
-    idecode_time(response, "update_time")
-    response = retriever_types.Corpus(**response)
-    return response
+    return retriever_types.decode_corpus(response)
 
 
 async def create_corpus_async(
@@ -87,11 +86,7 @@ async def create_corpus_async(
 
     request = glm.CreateCorpusRequest(corpus=corpus)
     response = await client.create_corpus(request)
-    response = type(response).to_dict(response)
-    idecode_time(response, "create_time")
-    idecode_time(response, "update_time")
-    response = retriever_types.Corpus(**response)
-    return response
+    return retriever_types.decode_corpus(response)
 
 
 def get_corpus(name: str, client: glm.RetrieverServiceClient | None = None) -> retriever_types.Corpus:  # fmt: skip
@@ -109,11 +104,7 @@ def get_corpus(name: str, client: glm.RetrieverServiceClient | None = None) -> r
 
     request = glm.GetCorpusRequest(name=name)
     response = client.get_corpus(request)
-    response = type(response).to_dict(response)
-    idecode_time(response, "create_time")
-    idecode_time(response, "update_time")
-    response = retriever_types.Corpus(**response)
-    return response
+    return retriever_types.decode_corpus(response)
 
 
 async def get_corpus_async(name: str, client: glm.RetrieverServiceAsyncClient | None = None) -> retriever_types.Corpus:  # fmt: skip
@@ -123,11 +114,7 @@ async def get_corpus_async(name: str, client: glm.RetrieverServiceAsyncClient |
 
     request = glm.GetCorpusRequest(name=name)
     response = await client.get_corpus(request)
-    response = type(response).to_dict(response)
-    idecode_time(response, "create_time")
-    idecode_time(response, "update_time")
-    response = retriever_types.Corpus(**response)
-    return response
+    return retriever_types.decode_corpus(response)
 
 
 def delete_corpus(name: str, force: bool = False, client: glm.RetrieverServiceClient | None = None):  # fmt: skip
@@ -173,9 +160,16 @@ def list_corpora(
         client = get_default_retriever_client()
 
     request = glm.ListCorporaRequest(page_size=page_size)
-    for corpus in client.list_corpora(request):
-        corpus = type(corpus).to_dict(corpus)
-        yield retriever_types.Corpus(**corpus)
+    pager = client.list_corpora(request)
+    if getattr(pager, "next_page_token", None) and hasattr(pager, "pages"):
+        # Fetch the next page while the caller works through this one.
+        for page in _prefetch(pager.pages):
+            for corpus in page.corpora:
+                yield retriever_types.decode_corpus(corpus)
+    else:
+        # A single page, there's nothing to fetch ahead.
+        for corpus in pager:
+            yield retriever_types.decode_corpus(corpus)
 
 
 async def list_corpora_async(
@@ -188,6 +182,63 @@ async def list_corpora_async(
         client = get_default_retriever_async_client()
 
     request = glm.ListCorporaRequest(page_size=page_size)
-    async for corpus in await client.list_corpora(request):
-        corpus = type(corpus).to_dict(corpus)
-        yield retriever_types.Corpus(**corpus)
+    pager = await client.list_corpora(request)
+    if getattr(pager, "next_page_token", None) and hasattr(pager, "pages"):
+        # Fetch the next page while the caller works through this one.
+        async for page in _prefetch_async(pager.pages):
+            for corpus in page.corpora:
+                yield retriever_types.decode_corpus(corpus)
+    else:
+        # A single page, there's nothing to fetch ahead.
+        async for corpus in pager:
+            yield retriever_types.decode_corpus(corpus)
+
+
+_DONE = object()
+
+
+def _prefetch(items: Iterable[T]) -> Iterator[T]:
+    """Iterates over `items` in a background thread, staying one item ahead of the caller."""
+    iterator = iter(items)
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(next, iterator, _DONE)
+    try:
+        while True:
+            item = future.result()
+            if item is _DONE:
+                return
+            future = executor.submit(next, iterator, _DONE)
+            yield item
+    finally:
+        # If the caller stopped early, don't block on a fetch nobody will use.
+        future.cancel()
+        executor.shutdown(wait=False)
+
+
+async def _prefetch_async(items: AsyncIterable[T]) -> AsyncIterator[T]:
+    """The async version of `_prefetch`, the items are fetched in a background task."""
+    queue = asyncio.Queue(maxsize=1)
+
+    async def produce():
+        try:
+            async for item in items:
+                await queue.put((item, None))
+                # Wait for the caller to take it, so at most one item is fetched ahead.
+                await queue.join()
+        except Exception as e:
+            await queue.put((_DONE, e))
+        else:
+            await queue.put((_DONE, None))
+
+    task = asyncio.ensure_future(produce())
+    try:
+        while True:
+            item, error = await queue.get()
+            queue.task_done()
+            if item is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        task.cancel()
@@ -32,7 +32,8 @@ from google.generativeai.types import citation_types
 from google.generativeai.types.model_types import idecode_time
 from google.generativeai.utils import flatten_update_paths
 
-_VALID_NAME = r"[a-z0-9]([a-z0-9-]{0,38}[a-z0-9])$"
+# At most 39 characters, see `NAME_ERROR_MSG`.
+_VALID_NAME = re.compile(r"[a-z0-9][a-z0-9-]{0,37}[a-z0-9]")
 NAME_ERROR_MSG = """The `name` must consist of alphanumeric characters (or -) and be 40 or fewer characters. The name you entered:
 \tlen(name)== {length}
 \tname={name}
@@ -40,7 +41,7 @@ NAME_ERROR_MSG = """The `name` must consist of alphanumeric characters (or -) an
 
 
 def valid_name(name):
-    return re.match(_VALID_NAME, name) and len(name) < 40
+    return _VALID_NAME.fullmatch(name) is not None
 
 
 Operator = glm.Condition.Operator
@@ -490,6 +491,23 @@ class Corpus:
         return result
 
 
+def _decode_timestamp(parent, name: str) -> datetime.datetime | None:
+    if not parent.HasField(name):
+        return None
+    return getattr(parent, name).ToDatetime(tzinfo=datetime.timezone.utc)
+
+
+def decode_corpus(corpus: glm.Corpus) -> Corpus:
+    # Reads the fields straight off the protobuf instead of round-tripping through `to_dict`.
+    corpus = type(corpus).pb(corpus)
+    return Corpus(
+        corpus.name,
+        corpus.display_name,
+        _decode_timestamp(corpus, "create_time"),
+        _decode_timestamp(corpus, "update_time"),
+    )
+
+
 def decode_document(document):
     document = type(document).to_dict(document)
     idecode_time(document, "create_time")
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import functools
+import operator
+import sys
+import types
 from typing import Mapping
 
-import typing
-from typing import Dict, Iterable, List, Union
+from typing import Iterable, List, Union
 
 from typing_extensions import TypedDict
 
@@ -29,138 +32,121 @@ HarmProbability = glm.SafetyRating.HarmProbability
 HarmBlockThreshold = glm.SafetySetting.HarmBlockThreshold
 BlockedReason = glm.ContentFilter.BlockedReason
 
+
+class _EnumValues(dict):
+    """Maps raw enum values to members of `enum`, without going through `enum.__call__`.
+
+    Values that aren't members are passed to `enum`, so they fail the same way they used to.
+    """
+
+    def __init__(self, enum):
+        super().__init__((m.value, m) for m in enum)
+        self._enum = enum
+
+    def __missing__(self, value):
+        return self._enum(value)
+
+
+_HARM_CATEGORY_BY_VALUE = _EnumValues(HarmCategory)
+_HARM_PROBABILITY_BY_VALUE = _EnumValues(HarmProbability)
+_HARM_BLOCK_THRESHOLD_BY_VALUE = _EnumValues(HarmBlockThreshold)
+_BLOCKED_REASON_BY_VALUE = _EnumValues(BlockedReason)
+
 HarmCategoryOptions = Union[str, int, HarmCategory]
 
-# fmt: off
-_OLD_HARM_CATEGORIES: Dict[HarmCategoryOptions, HarmCategory] = {
-    HarmCategory.HARM_CATEGORY_UNSPECIFIED: HarmCategory.HARM_CATEGORY_UNSPECIFIED,
-    0: HarmCategory.HARM_CATEGORY_UNSPECIFIED,
-    "harm_category_unspecified": HarmCategory.HARM_CATEGORY_UNSPECIFIED,
-    "unspecified": HarmCategory.HARM_CATEGORY_UNSPECIFIED,
-
-    HarmCategory.HARM_CATEGORY_DEROGATORY: HarmCategory.HARM_CATEGORY_DEROGATORY,
-    1: HarmCategory.HARM_CATEGORY_DEROGATORY,
-    "harm_category_derogatory": HarmCategory.HARM_CATEGORY_DEROGATORY,
-    "derogatory": HarmCategory.HARM_CATEGORY_DEROGATORY,
-
-    HarmCategory.HARM_CATEGORY_TOXICITY: HarmCategory.HARM_CATEGORY_TOXICITY,
-    2: HarmCategory.HARM_CATEGORY_TOXICITY,
-    "harm_category_toxicity": HarmCategory.HARM_CATEGORY_TOXICITY,
-    "toxicity": HarmCategory.HARM_CATEGORY_TOXICITY,
-    "toxic": HarmCategory.HARM_CATEGORY_TOXICITY,
-
-    HarmCategory.HARM_CATEGORY_VIOLENCE: HarmCategory.HARM_CATEGORY_VIOLENCE,
-    3: HarmCategory.HARM_CATEGORY_VIOLENCE,
-    "harm_category_violence": HarmCategory.HARM_CATEGORY_VIOLENCE,
-    "violence": HarmCategory.HARM_CATEGORY_VIOLENCE,
-    "violent": HarmCategory.HARM_CATEGORY_VIOLENCE,
-
-    HarmCategory.HARM_CATEGORY_SEXUAL: HarmCategory.HARM_CATEGORY_SEXUAL,
-    4: HarmCategory.HARM_CATEGORY_SEXUAL,
-    "harm_category_sexual": HarmCategory.HARM_CATEGORY_SEXUAL,
-    "sexual": HarmCategory.HARM_CATEGORY_SEXUAL,
-    "sex": HarmCategory.HARM_CATEGORY_SEXUAL,
-
-    HarmCategory.HARM_CATEGORY_MEDICAL: HarmCategory.HARM_CATEGORY_MEDICAL,
-    5: HarmCategory.HARM_CATEGORY_MEDICAL,
-    "harm_category_medical": HarmCategory.HARM_CATEGORY_MEDICAL,
-    "medical": HarmCategory.HARM_CATEGORY_MEDICAL,
-    "med": HarmCategory.HARM_CATEGORY_MEDICAL,
-
-    HarmCategory.HARM_CATEGORY_DANGEROUS: HarmCategory.HARM_CATEGORY_DANGEROUS,
-    6: HarmCategory.HARM_CATEGORY_DANGEROUS,
-    "harm_category_dangerous": HarmCategory.HARM_CATEGORY_DANGEROUS,
-    "dangerous": HarmCategory.HARM_CATEGORY_DANGEROUS,
-    "danger": HarmCategory.HARM_CATEGORY_DANGEROUS,
-}
 
-_NEW_HARM_CATEGORIES = {
-    7: HarmCategory.HARM_CATEGORY_HARASSMENT,
-    HarmCategory.HARM_CATEGORY_HARASSMENT: HarmCategory.HARM_CATEGORY_HARASSMENT,
-    "harm_category_harassment": HarmCategory.HARM_CATEGORY_HARASSMENT,
-    "harassment": HarmCategory.HARM_CATEGORY_HARASSMENT,
-
-    8: HarmCategory.HARM_CATEGORY_HATE_SPEECH,
-    HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmCategory.HARM_CATEGORY_HATE_SPEECH,
-    'harm_category_hate_speech': HarmCategory.HARM_CATEGORY_HATE_SPEECH,
-    'hate_speech': HarmCategory.HARM_CATEGORY_HATE_SPEECH,
-    'hate': HarmCategory.HARM_CATEGORY_HATE_SPEECH,
-
-    9: HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT,
-    HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT,
-    "harm_category_sexually_explicit": HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT,
-    "harm_category_sexual": HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT,
-    "sexual": HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT,
-    "sex": HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT,
-
-    10: HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
-    HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
-    "harm_category_dangerous_content": HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
-    "harm_category_dangerous": HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
-    "dangerous": HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
-    "danger": HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
-}
+def _build(groups) -> Mapping:
+    """Builds a read-only lookup table from `(member, aliases)` groups.
+
+    Every member maps to itself (enum members hash like their int values, so this covers ints
+    as well), and so do its lower-cased name and each alias. String keys are interned, so
+    canonical inputs can be matched by identity.
+    """
+    # The keys are interned so that lowered inputs, which `_lookup` interns too, hit by
+    # identity. The table is read-only so that nothing can add keys that skip this.
+    table = {}
+    for member, aliases in groups:
+        table[member] = member
+        table[sys.intern(member.name.lower())] = member
+        for alias in aliases:
+            table[sys.intern(alias)] = member
+    return types.MappingProxyType(table)
+
+
+# fmt: off
+_OLD_HARM_CATEGORIES: Mapping[HarmCategoryOptions, HarmCategory] = _build([
+    (HarmCategory.HARM_CATEGORY_UNSPECIFIED, ("unspecified",)),
+    (HarmCategory.HARM_CATEGORY_DEROGATORY, ("derogatory",)),
+    (HarmCategory.HARM_CATEGORY_TOXICITY, ("toxicity", "toxic")),
+    (HarmCategory.HARM_CATEGORY_VIOLENCE, ("violence", "violent")),
+    (HarmCategory.HARM_CATEGORY_SEXUAL, ("sexual", "sex")),
+    (HarmCategory.HARM_CATEGORY_MEDICAL, ("medical", "med")),
+    (HarmCategory.HARM_CATEGORY_DANGEROUS, ("dangerous", "danger")),
+])
+
+_NEW_HARM_CATEGORIES: Mapping[HarmCategoryOptions, HarmCategory] = _build([
+    (HarmCategory.HARM_CATEGORY_HARASSMENT, ("harassment",)),
+    (HarmCategory.HARM_CATEGORY_HATE_SPEECH, ("hate_speech", "hate")),
+    (HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT, ("harm_category_sexual", "sexual", "sex")),
+    (HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT, ("harm_category_dangerous", "dangerous", "danger")),
+])
 # fmt: on
 
 
+def _lookup(table: Mapping, x):
+    # Most inputs are already canonical, so only lower strings that miss.
+    try:
+        return table[x]
+    except KeyError:
+        if not isinstance(x, str):
+            raise
+    return table[sys.intern(x.lower())]
+
+
+@functools.lru_cache(maxsize=64)
 def to_old_harm_category(x: HarmCategoryOptions) -> HarmCategory:
-    if isinstance(x, str):
-        x = x.lower()
-    return _OLD_HARM_CATEGORIES[x]
+    return _lookup(_OLD_HARM_CATEGORIES, x)
 
 
+@functools.lru_cache(maxsize=64)
 def to_new_harm_category(x: HarmCategoryOptions) -> HarmCategory:
-    if isinstance(x, str):
-        x = x.lower()
-    return _NEW_HARM_CATEGORIES[x]
+    return _lookup(_NEW_HARM_CATEGORIES, x)
 
 
-def to_harm_category(x, harm_category_set):
-    if harm_category_set == "old":
-        return to_old_harm_category(x)
-    elif harm_category_set == "new":
-        return to_new_harm_category(x)
-    else:
+_HARM_CATEGORY_SETS = {
+    "old": _OLD_HARM_CATEGORIES,
+    "new": _NEW_HARM_CATEGORIES,
+}
+
+
+def _harm_category_table(harm_category_set) -> Mapping:
+    table = _HARM_CATEGORY_SETS.get(harm_category_set)
+    if table is None:
         raise ValueError("harm_category_set must be 'new' or 'old'")
+    return table
+
+
+@functools.lru_cache(maxsize=64)
+def to_harm_category(x, harm_category_set):
+    return _lookup(_harm_category_table(harm_category_set), x)
 
 
 HarmBlockThresholdOptions = Union[str, int, HarmBlockThreshold]
 
 # fmt: off
-_BLOCK_THRESHOLDS: Dict[HarmBlockThresholdOptions, HarmBlockThreshold] = {
-    HarmBlockThreshold.HARM_BLOCK_THRESHOLD_UNSPECIFIED: HarmBlockThreshold.HARM_BLOCK_THRESHOLD_UNSPECIFIED,
-    0: HarmBlockThreshold.HARM_BLOCK_THRESHOLD_UNSPECIFIED,
-    "harm_block_threshold_unspecified": HarmBlockThreshold.HARM_BLOCK_THRESHOLD_UNSPECIFIED,
-    "block_threshold_unspecified": HarmBlockThreshold.HARM_BLOCK_THRESHOLD_UNSPECIFIED,
-    "unspecified": HarmBlockThreshold.HARM_BLOCK_THRESHOLD_UNSPECIFIED,
-
-    HarmBlockThreshold.BLOCK_LOW_AND_ABOVE: HarmBlockThreshold.BLOCK_LOW_AND_ABOVE,
-    1: HarmBlockThreshold.BLOCK_LOW_AND_ABOVE,
-    "block_low_and_above": HarmBlockThreshold.BLOCK_LOW_AND_ABOVE,
-    "low": HarmBlockThreshold.BLOCK_LOW_AND_ABOVE,
-
-    HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-    2: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-    "block_medium_and_above": HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-    "medium": HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-    "med": HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-
-    HarmBlockThreshold.BLOCK_ONLY_HIGH: HarmBlockThreshold.BLOCK_ONLY_HIGH,
-    3: HarmBlockThreshold.BLOCK_ONLY_HIGH,
-    "block_only_high": HarmBlockThreshold.BLOCK_ONLY_HIGH,
-    "high": HarmBlockThreshold.BLOCK_ONLY_HIGH,
-
-    HarmBlockThreshold.BLOCK_NONE: HarmBlockThreshold.BLOCK_NONE,
-    4: HarmBlockThreshold.BLOCK_NONE,
-    "block_none": HarmBlockThreshold.BLOCK_NONE,
-}
+_BLOCK_THRESHOLDS: Mapping[HarmBlockThresholdOptions, HarmBlockThreshold] = _build([
+    (HarmBlockThreshold.HARM_BLOCK_THRESHOLD_UNSPECIFIED, ("block_threshold_unspecified", "unspecified")),
+    (HarmBlockThreshold.BLOCK_LOW_AND_ABOVE, ("low",)),
+    (HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE, ("medium", "med")),
+    (HarmBlockThreshold.BLOCK_ONLY_HIGH, ("high",)),
+    (HarmBlockThreshold.BLOCK_NONE, ()),
+])
 # fmt: on
 
 
+@functools.lru_cache(maxsize=64)
 def to_block_threshold(x: HarmBlockThresholdOptions) -> HarmCategory:
-    if isinstance(x, str):
-        x = x.lower()
-    return _BLOCK_THRESHOLDS[x]
+    return _lookup(_BLOCK_THRESHOLDS, x)
 
 
 class ContentFilterDict(TypedDict):
@@ -173,13 +159,8 @@ class ContentFilterDict(TypedDict):
 def convert_filters_to_enums(
     filters: Iterable[dict],
 ) -> List[ContentFilterDict]:
-    result = []
-    for f in filters:
-        f = f.copy()
-        f["reason"] = BlockedReason(f["reason"])
-        f = typing.cast(ContentFilterDict, f)
-        result.append(f)
-    return result
+    reasons = _BLOCKED_REASON_BY_VALUE
+    return [{**f, "reason": reasons[f["reason"]]} for f in filters]  # type: ignore
 
 
 class SafetyRatingDict(TypedDict):
@@ -191,16 +172,21 @@ class SafetyRatingDict(TypedDict):
 
 def convert_rating_to_enum(rating: dict) -> SafetyRatingDict:
     return {
-        "category": HarmCategory(rating["category"]),
-        "probability": HarmProbability(rating["probability"]),
+        "category": _HARM_CATEGORY_BY_VALUE[rating["category"]],
+        "probability": _HARM_PROBABILITY_BY_VALUE[rating["probability"]],
     }
 
 
+_get_rating_fields = operator.itemgetter("category", "probability")
+
+
 def convert_ratings_to_enum(ratings: Iterable[dict]) -> List[SafetyRatingDict]:
-    result = []
-    for r in ratings:
-        result.append(convert_rating_to_enum(r))
-    return result
+    categories = _HARM_CATEGORY_BY_VALUE
+    probabilities = _HARM_PROBABILITY_BY_VALUE
+    return [
+        {"category": categories[category], "probability": probabilities[probability]}
+        for category, probability in map(_get_rating_fields, ratings)
+    ]
 
 
 class SafetySettingDict(TypedDict):
@@ -220,19 +206,42 @@ EasySafetySetting = Mapping[HarmCategoryOptions, HarmBlockThresholdOptions]
 SafetySettingOptions = Union[EasySafetySetting, Iterable[LooseSafetySettingDict], None]
 
 
+def _is_normalized(category, threshold, categories: Mapping) -> bool:
+    return (
+        type(category) is HarmCategory
+        and category in categories
+        and type(threshold) is HarmBlockThreshold
+    )
+
+
+_get_setting_fields = operator.itemgetter("category", "threshold")
+
+
+def _setting_pairs(settings: SafetySettingOptions) -> Iterable[tuple]:
+    """Yields `(category, threshold)` from a mapping or an iterable of setting dicts."""
+    items = getattr(settings, "items", None)
+    if items is not None:
+        return items()
+    return map(_get_setting_fields, settings)
+
+
 def to_easy_safety_dict(settings: SafetySettingOptions, harm_category_set):
     if settings is None:
         return {}
-    elif isinstance(settings, Mapping):
-        return {
-            to_harm_category(key, harm_category_set): to_block_threshold(value)
-            for key, value in settings.items()
-        }
-    else:  # Iterable
-        return {
-            to_harm_category(d["category"], harm_category_set): to_block_threshold(d["threshold"])
-            for d in settings
-        }
+
+    categories = _harm_category_table(harm_category_set)
+    if type(settings) is dict and all(
+        _is_normalized(key, value, categories) for key, value in settings.items()
+    ):
+        return dict(settings)
+
+    # The converters are memoized, so repeated spellings are a single cache hit.
+    to_category = to_harm_category
+    to_threshold = to_block_threshold
+    return {
+        to_category(key, harm_category_set): to_threshold(value)
+        for key, value in _setting_pairs(settings)
+    }
 
 
 def normalize_safety_settings(
@@ -241,28 +250,32 @@ def normalize_safety_settings(
 ) -> List[SafetySettingDict] | None:
     if settings is None:
         return None
-    if isinstance(settings, Mapping):
-        return [
-            {
-                "category": to_harm_category(key, harm_category_set),
-                "threshold": to_block_threshold(value),
-            }
-            for key, value in settings.items()
-        ]
-    else:
-        return [
-            {
-                "category": to_harm_category(d["category"], harm_category_set),
-                "threshold": to_block_threshold(d["threshold"]),
-            }
-            for d in settings
-        ]
+
+    categories = _harm_category_table(harm_category_set)
+    if type(settings) is list and all(
+        type(d) is dict
+        and len(d) == 2
+        and _is_normalized(d.get("category"), d.get("threshold"), categories)
+        for d in settings
+    ):
+        # Already in the output format (e.g. round-tripped settings), only the list is copied.
+        return list(settings)
+
+    to_category = to_harm_category
+    to_threshold = to_block_threshold
+    return [
+        {
+            "category": to_category(key, harm_category_set),
+            "threshold": to_threshold(value),
+        }
+        for key, value in _setting_pairs(settings)
+    ]
 
 
 def convert_setting_to_enum(setting: dict) -> SafetySettingDict:
     return {
-        "category": HarmCategory(setting["category"]),
-        "threshold": HarmBlockThreshold(setting["threshold"]),
+        "category": _HARM_CATEGORY_BY_VALUE[setting["category"]],
+        "threshold": _HARM_BLOCK_THRESHOLD_BY_VALUE[setting["threshold"]],
     }
 
 
@@ -273,24 +286,38 @@ class SafetyFeedbackDict(TypedDict):
     __doc__ = string_utils.strip_oneof(glm.SafetyFeedback.__doc__)
 
 
+_get_feedback_fields = operator.itemgetter("rating", "setting")
+
+
 def convert_safety_feedback_to_enums(
     safety_feedback: Iterable[dict],
 ) -> List[SafetyFeedbackDict]:
+    get_rating = _get_rating_fields
+    get_setting = _get_setting_fields
+    categories = _HARM_CATEGORY_BY_VALUE
+    probabilities = _HARM_PROBABILITY_BY_VALUE
+    thresholds = _HARM_BLOCK_THRESHOLD_BY_VALUE
     result = []
-    for sf in safety_feedback:
+    for rating, setting in map(_get_feedback_fields, safety_feedback):
+        category, probability = get_rating(rating)
+        setting_category, threshold = get_setting(setting)
         result.append(
             {
-                "rating": convert_rating_to_enum(sf["rating"]),
-                "setting": convert_setting_to_enum(sf["setting"]),
+                "rating": {
+                    "category": categories[category],
+                    "probability": probabilities[probability],
+                },
+                "setting": {
+                    "category": categories[setting_category],
+                    "threshold": thresholds[threshold],
+                },
             }
         )
     return result
 
 
 def convert_candidate_enums(candidates):
-    result = []
-    for candidate in candidates:
-        candidate = candidate.copy()
-        candidate["safety_ratings"] = convert_ratings_to_enum(candidate["safety_ratings"])
-        result.append(candidate)
-    return result
+    return [
+        {**candidate, "safety_ratings": convert_ratings_to_enum(candidate["safety_ratings"])}
+        for candidate in candidates
+    ]
@@ -17,6 +17,7 @@ from __future__ import annotations
 import sys
 import abc
 import dataclasses
+import typing
 from typing import Any, Dict, List
 from typing_extensions import TypedDict
 
@@ -24,6 +25,8 @@ from google.generativeai import string_utils
 from google.generativeai.types import safety_types
 from google.generativeai.types import citation_types
 
+if typing.TYPE_CHECKING:
+    import numpy as np
 
 __all__ = ["Completion"]
 
@@ -40,6 +43,12 @@ class BatchEmbeddingDict(TypedDict):
     embedding: List[List[float]]
 
 
+class NumpyEmbeddingDict(TypedDict):
+    """An embedding (1D) or a batch of embeddings (2D), from `return_type="numpy"`."""
+
+    embedding: np.ndarray
+
+
 class TextCompletion(TypedDict, total=False):
     output: str
     safety_ratings: List[safety_types.SafetyRatingDict | None]
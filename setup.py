@@ -39,7 +39,17 @@ dependencies = [
 ]
 
 extras_require = {
-    "dev": ["absl-py", "black", "nose2", "pandas", "pytype", "pyyaml", "Pillow", "ipython"],
+    "dev": [
+        "absl-py",
+        "black",
+        "nose2",
+        "numpy",
+        "pandas",
+        "pytype",
+        "pyyaml",
+        "Pillow",
+        "ipython",
+    ],
 }
 
 url = "https://github.com/mvinoba/generative-ai-python_gen"
@@ -5,6 +5,7 @@ from absl.testing import absltest
 from absl.testing import parameterized
 
 from google.api_core import client_options
+from google.api_core import gapic_v1
 import google.ai.generativelanguage as glm
 from google.generativeai import client
 
@@ -39,6 +40,16 @@ class ClientTests(parameterized.TestCase):
         client_opts = client._client_manager.client_config["client_options"]
         self.assertEqual(client_opts.api_key, "AIzA_client")
 
+    @mock.patch.dict(os.environ, {"GOOGLE_API_KEY": "AIzA_env"})
+    def test_api_key_environment_read_once(self):
+        client.configure()
+
+        with mock.patch.dict(os.environ, {"GOOGLE_API_KEY": "AIzA_changed"}):
+            client.configure(transport="rest")
+
+        client_opts = client._client_manager.client_config["client_options"]
+        self.assertEqual(client_opts.api_key, "AIzA_env")
+
     def test_api_key_cannot_be_set_twice(self):
         client_opts = client_options.ClientOptions(api_key="AIzA_client_opts")
 
@@ -99,7 +110,11 @@ class ClientTests(parameterized.TestCase):
         text_client = client.get_default_text_client()
         text_client.generate_text()
 
-        self.assertEqual(metadata, text_client.metadata)
+        self.assertEqual(tuple(metadata), text_client.metadata)
+
+        # Per-call metadata goes first.
+        text_client.generate_text(metadata=[("per", "call")])
+        self.assertEqual((("per", "call"), ("hello", "world")), text_client.metadata)
 
         self.assertEqual(text_client.not_a_function, ClientTests.DummyClient.not_a_function)
 
@@ -110,7 +125,88 @@ class ClientTests(parameterized.TestCase):
         text_client.static()
 
         text_client.classm()
-        self.assertTrue(ClientTests.DummyClient.called_classm)
+        self.assertTrue(text_client.called_classm)
+
+        # The wrappers live on the class, not on each instance.
+        self.assertIsInstance(text_client, ClientTests.DummyClient)
+        self.assertNotIn("generate_text", vars(text_client))
+
+    @mock.patch.object(glm, "TextServiceClient")
+    def test_default_client_is_cached(self, mock_client_cls):
+        client.configure(api_key="AIzA_cached")
+        mock_client_cls.assert_not_called()
+
+        text_client = client.get_default_text_client()
+        mock_client_cls.assert_called_once()
+        self.assertIs(text_client, client.get_default_text_client())
+        mock_client_cls.assert_called_once()
+
+    def test_default_client_is_real_client(self):
+        client.configure(api_key="AIzA_real")
+        generative_client = client.get_default_generative_client()
+        self.assertIsInstance(generative_client, glm.GenerativeServiceClient)
+
+    @mock.patch.object(glm, "TextServiceClient")
+    def test_reconfigure_keeps_clients(self, mock_client_cls):
+        client.configure(api_key="AIzA_same")
+        client.get_default_text_client().generate_text()
+
+        client.configure(api_key="AIzA_same")
+        client.get_default_text_client().generate_text()
+        self.assertEqual(1, mock_client_cls.call_count)
+
+        client.configure(api_key="AIzA_other")
+        client.get_default_text_client().generate_text()
+        self.assertEqual(2, mock_client_cls.call_count)
+
+    def test_configure_same_args_is_noop(self):
+        client_info = gapic_v1.client_info.ClientInfo()
+        client.configure(api_key="AIzA_same", client_info=client_info)
+        client_config = client._client_manager.client_config
+        user_agent = client_info.user_agent
+
+        client.configure(api_key="AIzA_same", client_info=client_info)
+        self.assertIs(client_config, client._client_manager.client_config)
+        self.assertEqual(user_agent, client_info.user_agent)
+
+        client.configure(api_key="AIzA_other", client_info=client_info)
+        self.assertIsNot(client_config, client._client_manager.client_config)
+
+    def test_clients_share_channel(self):
+        client.configure(api_key="AIzA_shared")
+
+        generative_client = client.get_default_generative_client()
+        retriever_client = client.get_default_retriever_client()
+        self.assertIs(
+            generative_client.transport.grpc_channel, retriever_client.transport.grpc_channel
+        )
+
+        client.configure(api_key="AIzA_other")
+        model_client = client.get_default_model_client()
+        self.assertIsNot(
+            generative_client.transport.grpc_channel, model_client.transport.grpc_channel
+        )
+
+    def test_closing_a_client_keeps_shared_channel_open(self):
+        client.configure(api_key="AIzA_shared")
+        generative_client = client.get_default_generative_client()
+        retriever_client = client.get_default_retriever_client()
+
+        channel = retriever_client.transport.grpc_channel._channel
+        with mock.patch.object(channel, "close") as close:
+            generative_client.transport.close()
+            with retriever_client:
+                pass
+        close.assert_not_called()
+
+    def test_async_clients_dont_share_channel(self):
+        # `grpc.aio` channels are bound to an event loop, so each client gets its own.
+        client.configure(api_key="AIzA_async")
+        generative_client = client.get_default_generative_async_client()
+        retriever_client = client.get_default_retriever_async_client()
+        self.assertIsNot(
+            generative_client.transport.grpc_channel, retriever_client.transport.grpc_channel
+        )
 
     def test_same_config(self):
         cm1 = client._ClientManager()
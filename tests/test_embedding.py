@@ -12,14 +12,18 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import concurrent.futures
 import copy
 import math
 import unittest
 import unittest.mock as mock
 
+import numpy as np
+
 import google.ai.generativelanguage as glm
 
 from google.generativeai import embedding
+from google.generativeai.types import content_types
 
 from google.generativeai import client
 from absl.testing import absltest
@@ -71,6 +75,29 @@ class UnitTests(parameterized.TestCase):
         )
         self.assertIsInstance(emb["embedding"][0], float)
 
+    def test_embed_content_values(self):
+        content = glm.Content(parts=[glm.Part(text="What are you?")])
+        emb = embedding.embed_content(model=DEFAULT_EMB_MODEL, content=content)
+
+        self.assertEqual({"embedding": [1.0, 2.0, 3.0]}, emb)
+
+    def test_embed_content_values_are_exact_float32(self):
+        # Values are widened from float32 as is, not rounded to their shortest repr.
+        self.client.embed_content = lambda request: glm.EmbedContentResponse(
+            embedding=glm.ContentEmbedding(values=[0.1, 0.2])
+        )
+        self.client.batch_embed_contents = lambda request: glm.BatchEmbedContentsResponse(
+            embeddings=[glm.ContentEmbedding(values=[0.1, 0.2])] * len(request.requests)
+        )
+        content = glm.Content(parts=[glm.Part(text="What are you?")])
+        expected = [0.10000000149011612, 0.20000000298023224]
+
+        emb = embedding.embed_content(model=DEFAULT_EMB_MODEL, content=content)
+        self.assertEqual(expected, emb["embedding"])
+
+        emb = embedding.embed_content(model=DEFAULT_EMB_MODEL, content=[content] * 2)
+        self.assertEqual([expected] * 2, emb["embedding"])
+
     @parameterized.named_parameters(
         [
             dict(
@@ -101,6 +128,135 @@ class UnitTests(parameterized.TestCase):
             math.ceil(len(texts) / embedding.EMBEDDING_MAX_BATCH_SIZE),
         )
 
+    def test_batch_embed_contents_keeps_order(self):
+        def values(request):
+            return [float(r.content.parts[0].text) for r in request.requests]
+
+        def batch_embed_contents(request):
+            self.observed_requests.append(request)
+            return glm.BatchEmbedContentsResponse(
+                embeddings=[glm.ContentEmbedding(values=[v]) for v in values(request)]
+            )
+
+        self.client.batch_embed_contents = batch_embed_contents
+
+        contents = [glm.Content(parts=[glm.Part(text=str(i))]) for i in range(537)]
+        emb = embedding.embed_content(model=DEFAULT_EMB_MODEL, content=contents, max_concurrency=3)
+
+        self.assertLen(self.observed_requests, 6)
+        self.assertEqual([[float(i)] for i in range(537)], emb["embedding"])
+
+    def test_single_batch_skips_thread_pool(self):
+        contents = [glm.Content(parts=[glm.Part(text=str(i))]) for i in range(3)]
+        with mock.patch.object(concurrent.futures, "ThreadPoolExecutor") as mock_executor:
+            emb = embedding.embed_content(model=DEFAULT_EMB_MODEL, content=contents)
+
+        mock_executor.assert_not_called()
+        self.assertLen(emb["embedding"], 3)
+
+    def test_batch_embed_contents_from_generator(self):
+        contents = (glm.Content(parts=[glm.Part(text=str(i))]) for i in range(237))
+        emb = embedding.embed_content(model=DEFAULT_EMB_MODEL, content=contents)
+
+        self.assertLen(emb["embedding"], 237)
+        self.assertEqual([1.0, 2.0, 3.0], emb["embedding"][-1])
+
+    def test_batch_embed_contents_shared_fields(self):
+        contents = [glm.Content(parts=[glm.Part(text=str(i))]) for i in range(3)]
+        embedding.embed_content(
+            model=DEFAULT_EMB_MODEL,
+            content=contents,
+            task_type="retrieval_document",
+            title="Exploring AI",
+        )
+
+        expected = glm.BatchEmbedContentsRequest(
+            model=DEFAULT_EMB_MODEL,
+            requests=[
+                glm.EmbedContentRequest(
+                    model=DEFAULT_EMB_MODEL,
+                    content=c,
+                    task_type=embedding.EmbeddingTaskType.RETRIEVAL_DOCUMENT,
+                    title="Exploring AI",
+                )
+                for c in contents
+            ],
+        )
+        self.assertEqual(expected, self.observed_requests[-1])
+
+    def test_embed_content_numpy(self):
+        content = glm.Content(parts=[glm.Part(text="What are you?")])
+        emb = embedding.embed_content(model=DEFAULT_EMB_MODEL, content=content, return_type="numpy")
+
+        self.assertIsInstance(emb["embedding"], np.ndarray)
+        self.assertEqual(np.float32, emb["embedding"].dtype)
+        np.testing.assert_array_equal([1, 2, 3], emb["embedding"])
+
+    def test_batch_embed_contents_numpy(self):
+        contents = [glm.Content(parts=[glm.Part(text=str(i))]) for i in range(237)]
+        emb = embedding.embed_content(
+            model=DEFAULT_EMB_MODEL, content=contents, return_type="numpy"
+        )
+
+        self.assertEqual((237, 3), emb["embedding"].shape)
+        self.assertEqual(np.float32, emb["embedding"].dtype)
+        np.testing.assert_array_equal([[1, 2, 3]] * 237, emb["embedding"])
+
+    def test_batch_embed_contents_numpy_empty_batch(self):
+        def batch_embed_contents(request):
+            self.observed_requests.append(request)
+            if len(self.observed_requests) == 1:
+                return glm.BatchEmbedContentsResponse()
+            return glm.BatchEmbedContentsResponse(
+                embeddings=[glm.ContentEmbedding(values=[1, 2, 3])] * len(request.requests)
+            )
+
+        self.client.batch_embed_contents = batch_embed_contents
+
+        contents = [glm.Content(parts=[glm.Part(text=str(i))]) for i in range(237)]
+        emb = embedding.embed_content(
+            model=DEFAULT_EMB_MODEL, content=contents, max_concurrency=1, return_type="numpy"
+        )
+
+        self.assertEqual((137, 3), emb["embedding"].shape)
+
+    def test_batch_embed_contents_converts_repeated_strings_once(self):
+        def to_content(c):
+            return glm.Content(parts=[glm.Part(text=c)])
+
+        with mock.patch.object(
+            content_types, "to_content", side_effect=to_content
+        ) as mock_to_content:
+            embedding.embed_content(model=DEFAULT_EMB_MODEL, content=["a", "b", "a"] * 100)
+
+        # Duplicates in later batches reuse the first conversion.
+        self.assertEqual(2, mock_to_content.call_count)
+        texts = [
+            r.content.parts[0].text for batch in self.observed_requests for r in batch.requests
+        ]
+        self.assertEqual(["a", "b", "a"] * 100, texts)
+
+    @mock.patch.object(embedding, "_CONVERTED_CONTENT_CACHE_SIZE", 2)
+    def test_batch_embed_contents_conversion_cache_is_bounded(self):
+        def to_content(c):
+            return glm.Content(parts=[glm.Part(text=c)])
+
+        with mock.patch.object(
+            content_types, "to_content", side_effect=to_content
+        ) as mock_to_content:
+            embedding.embed_content(model=DEFAULT_EMB_MODEL, content=["a", "b", "a", "c", "b"])
+
+        # "b" was the least recently used string when "c" was added.
+        self.assertEqual(4, mock_to_content.call_count)
+
+    def test_bad_return_type(self):
+        with self.assertRaises(ValueError):
+            embedding.embed_content(model=DEFAULT_EMB_MODEL, content=["a"], return_type="tuple")
+
+    def test_bad_max_concurrency(self):
+        with self.assertRaises(ValueError):
+            embedding.embed_content(model=DEFAULT_EMB_MODEL, content=["a"], max_concurrency=0)
+
     def test_embed_content_title_and_task_1(self):
         text = "What are you?"
         emb = embedding.embed_content(
@@ -115,6 +271,29 @@ class UnitTests(parameterized.TestCase):
             embedding.EmbeddingTaskType.RETRIEVAL_DOCUMENT,
         )
 
+    @parameterized.parameters(
+        ["retrieval_document"],
+        ["Document"],
+        [2],
+        [embedding.EmbeddingTaskType.RETRIEVAL_DOCUMENT],
+    )
+    def test_to_task_type(self, task_type):
+        self.assertIs(
+            embedding.EmbeddingTaskType.RETRIEVAL_DOCUMENT, embedding.to_task_type(task_type)
+        )
+
+    def test_embed_content_title_without_task(self):
+        with self.assertRaises(ValueError):
+            embedding.embed_content(model=DEFAULT_EMB_MODEL, content="abc", title="Exploring AI")
+
+    def test_embed_content_task_type_zero(self):
+        embedding.embed_content(
+            model=DEFAULT_EMB_MODEL, content=glm.Content(parts=[glm.Part(text="abc")]), task_type=0
+        )
+        self.assertEqual(
+            embedding.EmbeddingTaskType.TASK_TYPE_UNSPECIFIED, self.observed_requests[-1].task_type
+        )
+
     def test_embed_content_title_and_task_2(self):
         text = "What are you?"
         with self.assertRaises(ValueError):
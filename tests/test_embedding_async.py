@@ -12,7 +12,9 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import asyncio
 import copy
+import gc
 import math
 import unittest
 import unittest.mock as mock
@@ -100,6 +102,64 @@ class AsyncTests(parameterized.TestCase, unittest.IsolatedAsyncioTestCase):
             math.ceil(len(texts) / embedding.EMBEDDING_MAX_BATCH_SIZE),
         )
 
+    async def test_batch_embed_contents_keeps_order_async(self):
+        def values(request):
+            return [float(r.content.parts[0].text) for r in request.requests]
+
+        async def batch_embed_contents(request):
+            self.observed_requests.append(request)
+            return glm.BatchEmbedContentsResponse(
+                embeddings=[glm.ContentEmbedding(values=[v]) for v in values(request)]
+            )
+
+        self.client.batch_embed_contents = batch_embed_contents
+
+        contents = [glm.Content(parts=[glm.Part(text=str(i))]) for i in range(537)]
+        emb = await embedding.embed_content_async(
+            model=DEFAULT_EMB_MODEL, content=contents, max_concurrency=3
+        )
+
+        self.assertLen(self.observed_requests, 6)
+        self.assertEqual([[float(i)] for i in range(537)], emb["embedding"])
+
+    async def test_batch_failure_waits_for_cancelled_batches_async(self):
+        calls = 0
+
+        async def batch_embed_contents(request):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(0)
+                raise ValueError("Failed batch.")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                raise RuntimeError("Failed while cancelling.")
+
+        self.client.batch_embed_contents = batch_embed_contents
+
+        errors = []
+        asyncio.get_running_loop().set_exception_handler(
+            lambda loop, context: errors.append(context)
+        )
+        with self.assertRaises(ValueError):
+            await embedding.embed_content_async(
+                model=DEFAULT_EMB_MODEL,
+                content=[glm.Content(parts=[glm.Part(text="a")])] * 500,
+                max_concurrency=5,
+            )
+        await asyncio.sleep(0)
+        gc.collect()
+
+        # No "Task exception was never retrieved" from the other batches.
+        self.assertEqual([], errors)
+
+    async def test_bad_max_concurrency_async(self):
+        with self.assertRaises(ValueError):
+            await embedding.embed_content_async(
+                model=DEFAULT_EMB_MODEL, content=["a"], max_concurrency=0
+            )
+
     async def test_embed_content_async_title_and_task_1(self):
         text = "What are you?"
         emb = await embedding.embed_content_async(
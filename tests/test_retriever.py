@@ -12,6 +12,10 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import concurrent.futures
+import datetime
+import threading
+import time
 import unittest
 import unittest.mock as mock
 
@@ -318,6 +322,22 @@ class UnitTests(parameterized.TestCase):
         self.assertIsInstance(x, retriever_service.Corpus)
         self.assertEqual("demo-corpus", x.display_name)
         self.assertEqual("corpora/demo_corpus", x.name)
+        self.assertEqual(
+            datetime.datetime(2000, 1, 1, 1, 1, 1, 123456, tzinfo=datetime.timezone.utc),
+            x.create_time,
+        )
+
+    @parameterized.named_parameters(
+        ["simple", "demo-corpus", True],
+        ["max_length", "a" * 39, True],
+        ["too_long", "a" * 40, False],
+        ["leading_dash", "-corpus", False],
+        ["trailing_dash", "corpus-", False],
+        ["uppercase", "Corpus", False],
+        ["trailing_newline", "corpus\n", False],
+    )
+    def test_valid_name(self, name, expected):
+        self.assertEqual(expected, retriever_service.valid_name(name))
 
     def test_get_corpus(self, name="demo-corpus"):
         x = retriever.create_corpus(name=name)
@@ -333,6 +353,57 @@ class UnitTests(parameterized.TestCase):
     def test_list_corpora(self):
         x = list(retriever.list_corpora(page_size=1))
         self.assertEqual(len(x), 2)
+        self.assertIsInstance(x[0].update_time, datetime.datetime)
+
+    def test_list_corpora_pages(self):
+        class Pager:
+            next_page_token = "page-1"
+
+            @property
+            def pages(self):
+                for i in range(3):
+                    yield glm.ListCorporaResponse(
+                        corpora=[
+                            glm.Corpus(name=f"corpora/page-{i}-{j}", display_name="demo")
+                            for j in range(2)
+                        ]
+                    )
+
+        self.client.list_corpora = lambda request: Pager()
+
+        x = [c.name for c in retriever.list_corpora(page_size=2)]
+        self.assertEqual([f"corpora/page-{i}-{j}" for i in range(3) for j in range(2)], x)
+
+    def test_list_corpora_single_page_skips_prefetch(self):
+        with mock.patch.object(concurrent.futures, "ThreadPoolExecutor") as mock_executor:
+            x = list(retriever.list_corpora(page_size=2))
+
+        mock_executor.assert_not_called()
+        self.assertLen(x, 2)
+
+    def test_list_corpora_close_does_not_wait_for_prefetch(self):
+        release = threading.Event()
+
+        class Pager:
+            next_page_token = "page-1"
+
+            @property
+            def pages(self):
+                yield glm.ListCorporaResponse(corpora=[glm.Corpus(name="corpora/page-0")])
+                # The next page hangs until the test is done.
+                release.wait(10)
+                yield glm.ListCorporaResponse(corpora=[glm.Corpus(name="corpora/page-1")])
+
+        self.client.list_corpora = lambda request: Pager()
+
+        corpora = retriever.list_corpora(page_size=1)
+        next(corpora)
+        start = time.monotonic()
+        corpora.close()
+        elapsed = time.monotonic() - start
+        release.set()
+
+        self.assertLess(elapsed, 5)
 
     def test_query_corpus(self):
         demo_corpus = retriever.create_corpus(name="demo-corpus")
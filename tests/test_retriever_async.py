@@ -15,6 +15,7 @@
 import collections
 import copy
 import math
+import asyncio
 import unittest
 import unittest.mock as mock
 
@@ -340,6 +341,38 @@ class AsyncTests(parameterized.TestCase, unittest.IsolatedAsyncioTestCase):
         self.assertIsInstance(result, list)
         self.assertEqual(len(result), 2)
 
+    async def test_list_corpora_pages(self):
+        requested_pages = []
+
+        class Pager:
+            next_page_token = "page-1"
+
+            @property
+            async def pages(self):
+                for i in range(3):
+                    requested_pages.append(i)
+                    yield glm.ListCorporaResponse(
+                        corpora=[
+                            glm.Corpus(name=f"corpora/page-{i}-{j}", display_name="demo")
+                            for j in range(2)
+                        ]
+                    )
+
+        async def list_corpora(request):
+            return Pager()
+
+        self.client.list_corpora = list_corpora
+
+        result = []
+        async for x in retriever.list_corpora_async(page_size=2):
+            if not result:
+                # The second page was fetched while the first one is being consumed.
+                await asyncio.sleep(0)
+                self.assertEqual([0, 1], requested_pages)
+            result.append(x.name)
+
+        self.assertEqual([f"corpora/page-{i}-{j}" for i in range(3) for j in range(2)], result)
+
     async def test_query_corpus(self):
         demo_corpus = await retriever.create_corpus_async(name="demo-corpus")
         demo_document = await demo_corpus.create_document_async(name="demo-doc")
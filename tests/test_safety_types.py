@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+# Copyright 2023 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from absl.testing import absltest
+from absl.testing import parameterized
+
+from google.generativeai.types import safety_types
+
+
+class UnitTests(parameterized.TestCase):
+    @parameterized.named_parameters(
+        ["lower", "dangerous"],
+        ["upper", "DANGEROUS"],
+        ["full_name", "HARM_CATEGORY_DANGEROUS"],
+        ["int", 6],
+        ["enum", safety_types.HarmCategory.HARM_CATEGORY_DANGEROUS],
+    )
+    def test_to_old_harm_category(self, x):
+        self.assertEqual(
+            safety_types.HarmCategory.HARM_CATEGORY_DANGEROUS,
+            safety_types.to_old_harm_category(x),
+        )
+
+    @parameterized.named_parameters(
+        ["lower", "dangerous"],
+        ["mixed", "Harm_Category_Dangerous_Content"],
+        ["int", 10],
+        ["enum", safety_types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT],
+    )
+    def test_to_new_harm_category(self, x):
+        self.assertEqual(
+            safety_types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
+            safety_types.to_new_harm_category(x),
+        )
+
+    @parameterized.named_parameters(
+        ["lower", "block_none"],
+        ["upper", "BLOCK_NONE"],
+        ["int", 4],
+        ["enum", safety_types.HarmBlockThreshold.BLOCK_NONE],
+    )
+    def test_to_block_threshold(self, x):
+        self.assertEqual(
+            safety_types.HarmBlockThreshold.BLOCK_NONE, safety_types.to_block_threshold(x)
+        )
+
+    def test_to_harm_category(self):
+        self.assertEqual(
+            safety_types.HarmCategory.HARM_CATEGORY_DANGEROUS,
+            safety_types.to_harm_category("Dangerous", "old"),
+        )
+        self.assertEqual(
+            safety_types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
+            safety_types.to_harm_category("Dangerous", "new"),
+        )
+        with self.assertRaises(ValueError):
+            safety_types.to_harm_category("dangerous", "newer")
+
+    @parameterized.named_parameters(
+        ["dict", {"Dangerous": "block_none", 7: "LOW"}],
+        [
+            "list",
+            [
+                {"category": "Dangerous", "threshold": "block_none"},
+                {"category": 7, "threshold": "LOW"},
+            ],
+        ],
+    )
+    def test_normalize_safety_settings(self, settings):
+        expected = [
+            {
+                "category": safety_types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
+                "threshold": safety_types.HarmBlockThreshold.BLOCK_NONE,
+            },
+            {
+                "category": safety_types.HarmCategory.HARM_CATEGORY_HARASSMENT,
+                "threshold": safety_types.HarmBlockThreshold.BLOCK_LOW_AND_ABOVE,
+            },
+        ]
+        self.assertEqual(expected, safety_types.normalize_safety_settings(settings, "new"))
+        self.assertEqual(
+            {d["category"]: d["threshold"] for d in expected},
+            safety_types.to_easy_safety_dict(settings, "new"),
+        )
+
+    def test_settings_use_cached_converters(self):
+        settings = {"Dangerous": "Block_None"}
+        safety_types.normalize_safety_settings(settings, "new")
+        hits = safety_types.to_block_threshold.cache_info().hits
+
+        safety_types.to_easy_safety_dict(settings, "new")
+        self.assertEqual(hits + 1, safety_types.to_block_threshold.cache_info().hits)
+
+    def test_normalize_already_normalized(self):
+        settings = [
+            {
+                "category": safety_types.HarmCategory.HARM_CATEGORY_HARASSMENT,
+                "threshold": safety_types.HarmBlockThreshold.BLOCK_NONE,
+            }
+        ]
+        result = safety_types.normalize_safety_settings(settings, "new")
+        self.assertEqual(settings, result)
+        self.assertIsNot(settings, result)
+
+        # Categories from the other set are still rejected.
+        with self.assertRaises(KeyError):
+            safety_types.normalize_safety_settings(settings, "old")
+        with self.assertRaises(KeyError):
+            safety_types.to_easy_safety_dict(
+                {
+                    safety_types.HarmCategory.HARM_CATEGORY_HARASSMENT: (
+                        safety_types.HarmBlockThreshold.BLOCK_NONE
+                    )
+                },
+                "old",
+            )
+
+    def test_convert_ratings_to_enum(self):
+        ratings = safety_types.convert_ratings_to_enum(
+            [{"category": 6, "probability": 4}, {"category": 2, "probability": 1}]
+        )
+        self.assertEqual(
+            [
+                {
+                    "category": safety_types.HarmCategory.HARM_CATEGORY_DANGEROUS,
+                    "probability": safety_types.HarmProbability.HIGH,
+                },
+                {
+                    "category": safety_types.HarmCategory.HARM_CATEGORY_TOXICITY,
+                    "probability": safety_types.HarmProbability.NEGLIGIBLE,
+                },
+            ],
+            ratings,
+        )
+        self.assertIsInstance(ratings[0]["category"], safety_types.HarmCategory)
+        self.assertIsInstance(ratings[0]["probability"], safety_types.HarmProbability)
+
+        with self.assertRaises(ValueError):
+            safety_types.convert_ratings_to_enum([{"category": 999, "probability": 1}])
+
+    def test_convert_safety_feedback_to_enums(self):
+        feedback = safety_types.convert_safety_feedback_to_enums(
+            [
+                {
+                    "rating": {"category": 5, "probability": 4},
+                    "setting": {"category": 5, "threshold": 4},
+                }
+            ]
+        )
+        self.assertEqual(
+            [
+                {
+                    "rating": {
+                        "category": safety_types.HarmCategory.HARM_CATEGORY_MEDICAL,
+                        "probability": safety_types.HarmProbability.HIGH,
+                    },
+                    "setting": {
+                        "category": safety_types.HarmCategory.HARM_CATEGORY_MEDICAL,
+                        "threshold": safety_types.HarmBlockThreshold.BLOCK_NONE,
+                    },
+                }
+            ],
+            feedback,
+        )
+        self.assertIsInstance(feedback[0]["setting"]["threshold"], safety_types.HarmBlockThreshold)
+
+    def test_convert_filters_to_enums(self):
+        filters = [{"reason": 1, "message": "blocked"}]
+        result = safety_types.convert_filters_to_enums(filters)
+        self.assertEqual(
+            [{"reason": safety_types.BlockedReason.SAFETY, "message": "blocked"}], result
+        )
+        self.assertIsInstance(result[0]["reason"], safety_types.BlockedReason)
+        # The input is left untouched.
+        self.assertEqual([{"reason": 1, "message": "blocked"}], filters)
+
+    @parameterized.named_parameters(
+        ["old_harm_categories", safety_types._OLD_HARM_CATEGORIES],
+        ["new_harm_categories", safety_types._NEW_HARM_CATEGORIES],
+        ["block_thresholds", safety_types._BLOCK_THRESHOLDS],
+    )
+    def test_tables_are_read_only(self, table):
+        with self.assertRaises(TypeError):
+            table["new_key"] = None
+        with self.assertRaises(AttributeError):
+            table.update(new_key=None)
+
+    def test_unknown_keys(self):
+        with self.assertRaises(KeyError):
+            safety_types.to_block_threshold("not_a_threshold")
+        # Failures aren't cached.
+        with self.assertRaises(KeyError):
+            safety_types.to_block_threshold("not_a_threshold")
+        with self.assertRaises(KeyError):
+            safety_types.to_new_harm_category(6)
+
+
+if __name__ == "__main__":
+    absltest.main()